@@ -1,7 +1,6 @@
 import asyncio
 import base64
 import inspect
-import json
 import logging
 import uuid
 from collections.abc import Callable
@@ -10,6 +9,7 @@ from typing import (Any, Awaitable, Dict, List, Optional, Type, Union,
                     get_args, get_origin, get_type_hints)
 
 import aiofiles
+import msgpack
 
 from .utils import ResponseCode
 from .utils.states import ClientState
@@ -180,7 +180,7 @@ class Client:
         Raises:
             ValueError: Если один из параметров некорректен.
         """
-        if not all([login, password]):
+        if not login or not password:
             raise ValueError("Login, password cannot be empty")
 
         cls._login = login
@@ -358,7 +358,7 @@ class Client:
             name = receive_package.get("name", None)
             chunk_base64 = receive_package.get("chunk", None)
 
-            if not all([name, chunk_base64]):
+            if not name or not chunk_base64:
                 return
 
             file_path: Path = (
@@ -391,13 +391,12 @@ class Client:
 
     @classmethod
     def _encode_data(cls, data: dict) -> bytes:
-        json_data = json.dumps(data, ensure_ascii=False)
-        return json_data.encode("utf-8")
+        return msgpack.packb(data, use_bin_type=True)
 
     @classmethod
     def _decode_data(cls, encoded_data: bytes) -> dict:
-        json_data = encoded_data.decode("utf-8")
-        return json.loads(json_data)
+        # Ответы сервера могут содержать не строковые ключи (например, int)
+        return msgpack.unpackb(encoded_data, raw=False, strict_map_key=False)
 
     @classmethod
     async def _send_raw_data(cls, data: bytes) -> None:
@@ -1,10 +1,12 @@
 import asyncio
 import inspect
 import logging
-from collections.abc import Callable
+from collections.abc import Awaitable, Callable
+from functools import wraps
 from pathlib import Path
-from typing import (Any, Dict, List, Optional, Type, Union, get_args,
-                    get_origin, get_type_hints)
+from types import UnionType
+from typing import (Any, Dict, FrozenSet, List, Optional, Tuple, Type, Union,
+                    get_args, get_origin, get_type_hints)
 
 import aiohttp
 
@@ -12,9 +14,21 @@ from .utils import ClUnit, ResponseCode, ServerDB
 
 logger = logging.getLogger("DMBN:Server")
 
+_NET_REQ = int(ResponseCode.NET_REQ)
+_GET_REQ = int(ResponseCode.GET_REQ)
+# Кортеж, а не множество: нехешируемый 'code' от клиента не вызовет TypeError
+_CLIENT_AUTH_CODE_VALUES = (
+    int(ResponseCode.AUTH_ANS_LOGIN),
+    int(ResponseCode.AUTH_ANS_REGIS),
+)
+# Служебные ключи пакета, которые не передаются в сетевые функции
+_RESERVED_KEYS = frozenset({"cl_unit", "code", "net_func_name", "net_get_key"})
+# Запрос авторизации одинаков для всех подключений, кодируется один раз
+_AUTH_REQ_PACKAGE = ClUnit.encode_package(ResponseCode.AUTH_REQ)
+
 
 class Server:
-    _network_funcs: Dict[str, Callable] = {}
+    _network_funcs: Dict[str, Callable[[ClUnit, Dict[str, Any]], Awaitable[Any]]] = {}
     _cl_units: Dict[str, ClUnit] = {}
     _server: Optional[asyncio.AbstractServer] = None
     _cl_units_lock = asyncio.Lock()
@@ -24,6 +38,9 @@ class Server:
     _host: str = ""
     _port: int = 0
     _server_name: str = "dev"
+    _auth_serve_package: bytes = ClUnit.encode_package(
+        ResponseCode.AUTH_ANS_SERVE, server_name=_server_name
+    )
     _server_desc: str = "None"
     _server_tags: List[str] = []
     _server_additional_links: Dict[str, str] = {}
@@ -48,53 +65,104 @@ class Server:
             ):
                 if name.startswith("net_"):
                     method_name = name[4:]
-                    cls._network_funcs[method_name] = func
+                    cls._network_funcs[method_name] = cls._build_dispatcher(
+                        method_name, func
+                    )
                     logger.debug(
                         f"Registered method '{name}' from {external_class.__name__} as '{method_name}'"
                     )
 
-    @classmethod
-    async def _call_func(
-        cls,
-        func_name: str,
-        cl_unit: ClUnit,
-        **kwargs,
-    ) -> Any:
-        func = cls._network_funcs.get(func_name)
-        if func is None:
-            logger.debug(f"Network func '{func_name}' not found.")
-            return
+    @staticmethod
+    def _as_coroutine_func(func: Callable) -> Callable[..., Awaitable[Any]]:
+        """Приводит сетевую функцию к асинхронному виду один раз при регистрации."""
+        if inspect.iscoroutinefunction(func):
+            return func
+
+        @wraps(func)
+        async def wrapper(**kwargs):
+            return func(**kwargs)
 
-        sig = inspect.signature(func)
-        valid_kwargs = {k: v for k, v in kwargs.items() if k in sig.parameters}
+        return wrapper
 
+    @classmethod
+    def _build_func_meta(cls, func: Callable) -> Tuple[FrozenSet[str], Dict[str, Any]]:
+        """Разбор сигнатуры сетевой функции один раз при регистрации.
+
+        Returns:
+            Tuple: Имена принимаемых аргументов (без служебных ключей) и типы
+            для проверки через isinstance.
+        """
+        params = frozenset(inspect.signature(func).parameters) - _RESERVED_KEYS
         type_hints = get_type_hints(func)
 
-        for arg_name, arg_value in valid_kwargs.items():
+        expected_types: Dict[str, Any] = {}
+        for arg_name in params:
             expected_type = type_hints.get(arg_name, Any)
-            if get_origin(expected_type) is Union:
-                if not isinstance(arg_value, get_args(expected_type)):
-                    await cl_unit.send_log_error(
-                        f"Type mismatch for argument '{arg_name}': expected {expected_type}, got {type(arg_value)}."
-                    )
-                    return
+            if expected_type is Any:
+                continue
+
+            origin = get_origin(expected_type)
+            if origin is Union or origin is UnionType:
+                expected_types[arg_name] = tuple(
+                    get_origin(arg) or arg for arg in get_args(expected_type)
+                )
 
             else:
+                expected_types[arg_name] = origin or expected_type
+
+        return params, expected_types
+
+    @classmethod
+    def _build_dispatcher(
+        cls, func_name: str, func: Callable
+    ) -> Callable[[ClUnit, Dict[str, Any]], Awaitable[Any]]:
+        """Сборка обработчика пакета под конкретную сетевую функцию.
+
+        Всё, что известно из сигнатуры, вычисляется здесь один раз, и
+        при получении пакета остаются только выборка аргументов,
+        isinstance-проверки и вызов.
+        """
+        call = cls._as_coroutine_func(func)
+        params, expected_types = cls._build_func_meta(func)
+        type_checks = tuple(expected_types.items())
+
+        async def dispatch(cl_unit: ClUnit, package: Dict[str, Any]) -> Any:
+            valid_kwargs = {k: package[k] for k in package.keys() & params}
+
+            for arg_name, expected_type in type_checks:
+                if arg_name not in valid_kwargs:
+                    continue
+
+                arg_value = valid_kwargs[arg_name]
                 if not isinstance(arg_value, expected_type):
                     await cl_unit.send_log_error(
                         f"Type mismatch for argument '{arg_name}': expected {expected_type}, got {type(arg_value)}."
                     )
                     return
 
-        try:
-            if inspect.iscoroutinefunction(func):
-                return await func(cl_unit=cl_unit, **valid_kwargs)
+            try:
+                return await call(cl_unit=cl_unit, **valid_kwargs)
 
-            else:
-                return func(cl_unit=cl_unit, **valid_kwargs)
+            except Exception as e:
+                logger.error(
+                    f"Error calling method '{func_name}' in {cls.__name__}: {e}"
+                )
 
-        except Exception as e:
-            logger.error(f"Error calling method '{func_name}' in {cls.__name__}: {e}")
+        return dispatch
+
+    @classmethod
+    async def _call_func(
+        cls,
+        func_name: Optional[str],
+        cl_unit: ClUnit,
+        package: Dict[str, Any],
+    ) -> Any:
+        dispatch = cls._network_funcs.get(func_name)
+        if dispatch is None:
+            logger.debug(f"Network func '{func_name}' not found.")
+            return
+
+        return await dispatch(cl_unit, package)
 
     @classmethod
     async def setup_server(
@@ -108,8 +176,29 @@ class Server:
         allow_registration: bool,
         timeout: float,
         max_player: int = -1,  # inf
+        reuse_port: bool = False,
     ) -> None:
+        """Настройка сервера перед запуском.
+
+        Args:
+            server_name (str): Имя сервера, передаётся клиентам и хабам.
+            host (str): Адрес, на котором сервер принимает подключения.
+            port (int): Порт, на котором сервер принимает подключения.
+            db_path (str | Path): Папка для файла базы данных сервера.
+            init_owner_password (str): Пароль пользователя owner при создании БД.
+            base_access (Dict[str, bool]): Права доступа новых пользователей.
+            allow_registration (bool): Разрешена ли регистрация новых пользователей.
+            timeout (float): Время ожидания ответа клиента на авторизацию, в секундах.
+            max_player (int, optional): Максимум игроков, -1 без ограничения.
+                По умолчанию -1.
+            reuse_port (bool, optional): Включить SO_REUSEPORT, чтобы несколько
+                процессов слушали один порт. Подключения, лимит игроков и кэш
+                ServerDB у каждого процесса свои. По умолчанию False.
+        """
         cls._server_name = server_name
+        cls._auth_serve_package = ClUnit.encode_package(
+            ResponseCode.AUTH_ANS_SERVE, server_name=server_name
+        )
         cls._allow_registration = allow_registration
         cls._timeout = timeout
         cls._max_players = max_player
@@ -121,7 +210,9 @@ class Server:
         cls._host = host
         cls._port = port
 
-        cls._server = await asyncio.start_server(cls._cl_handler, host, port)
+        cls._server = await asyncio.start_server(
+            cls._cl_handler, host, port, reuse_port=reuse_port
+        )
         logger.info(f"Server setup. Host: {host}, port:{port}.")
 
     @classmethod
@@ -148,6 +239,10 @@ class Server:
     def get_max_players(cls) -> int:
         return cls._max_players
 
+    @classmethod
+    def _is_full(cls) -> bool:
+        return cls._max_players != -1 and cls._max_players <= len(cls._cl_units)
+
     @classmethod
     def set_max_players(cls, value: int) -> None:
         if value < -1:
@@ -245,12 +340,16 @@ class Server:
         for hub in cls._hub_list:
             await hub.close()
 
-        await asyncio.gather(
-            *(
-                cl_unit.disconnect("Server shutdown")
-                for cl_unit in cls._cl_units.values()
-            )
+        cl_units = list(cls._cl_units.values())
+        results = await asyncio.gather(
+            *(cl_unit.disconnect("Server shutdown") for cl_unit in cl_units),
+            return_exceptions=True,
         )
+
+        for cl_unit, result in zip(cl_units, results):
+            if isinstance(result, Exception):
+                logger.error(f"Error disconnecting {cl_unit.login}: {result}")
+
         cls._cl_units.clear()
 
         if cls._server:
@@ -268,21 +367,63 @@ class Server:
         *args,
         **kwargs,
     ) -> None:
-        tasks = []
+        """Вызов метода ClUnit у каждого подключения.
+
+        Вызовы выполняются одновременно: получатель, который перестал
+        читать, не задерживает отправку остальным.
+        """
+        func = getattr(ClUnit, func_name, None)
+        if not callable(func):
+            logger.error(f"{func_name} is not a callable method of ClUnit")
+            return
 
         if cl_units_dict is None:
             cl_units_dict = cls._cl_units
 
-        for cl_unit in cl_units_dict.values():
-            func = getattr(cl_unit, func_name, None)
-            if callable(func):
-                tasks.append(func(*args, **kwargs))
+        cl_units = list(cl_units_dict.values())
+        results = await asyncio.gather(
+            *(func(cl_unit, *args, **kwargs) for cl_unit in cl_units),
+            return_exceptions=True,
+        )
 
-            else:
-                logger.error(f"{func_name} is not a callable method of {cl_unit}")
+        for cl_unit, result in zip(cl_units, results):
+            if isinstance(result, Exception):
+                logger.error(
+                    f"Error broadcasting '{func_name}' to {cl_unit.login}: {result}"
+                )
 
-        if tasks:
-            await asyncio.gather(*tasks)
+    @classmethod
+    async def broadcast_package(
+        cls,
+        code: ResponseCode,
+        cl_units_dict: Optional[Dict[str, ClUnit]] = None,
+        **kwargs,
+    ) -> None:
+        """Отправка одного пакета всем подключениям.
+
+        Пакет кодируется один раз и сразу ставится в буфер отправки
+        каждого получателя. Освобождения сокетов ждём одновременно, чтобы
+        клиент, переставший читать, не задерживал остальных.
+        """
+        data = ClUnit.encode_package(code, **kwargs)
+
+        if cl_units_dict is None:
+            cl_units_dict = cls._cl_units
+
+        cl_units = list(cl_units_dict.values())
+        for cl_unit in cl_units:
+            cl_unit.queue_raw(data)
+
+        results = await asyncio.gather(
+            *(cl_unit.writer.drain() for cl_unit in cl_units),
+            return_exceptions=True,
+        )
+
+        for cl_unit, result in zip(cl_units, results):
+            if isinstance(result, Exception):
+                logger.error(
+                    f"Error broadcasting package {code} to {cl_unit.login}: {result}"
+                )
 
     @classmethod
     async def remove_user(cls, login: str) -> None:
@@ -318,8 +459,12 @@ class Server:
             return
 
         async with cls._cl_units_lock:
+            old_cl_unit = cls._cl_units.get(cl_unit.login, None)
             cls._cl_units[cl_unit.login] = cl_unit
 
+        if old_cl_unit is not None:
+            await cls._close_replaced_session(old_cl_unit)
+
         logger.info(f"{cl_unit.login} is connected")
 
         try:
@@ -330,29 +475,26 @@ class Server:
                         await cl_unit.send_log_error("Receive data type expected dict")
                         continue
 
-                    code = receive_package.pop("code", None)
-                    if not code:
-                        await cl_unit.send_log_error("Receive data must has 'code' key")
-                        continue
-
-                    if code == ResponseCode.NET_REQ:
-                        func_name = receive_package.pop("net_func_name", None)
+                    code = receive_package.get("code", None)
+                    if code == _NET_REQ:
                         await cls._call_func(
-                            func_name,
+                            receive_package.get("net_func_name", None),
                             cl_unit,
-                            **receive_package,
+                            receive_package,
                         )
 
-                    elif code == ResponseCode.GET_REQ:
-                        func_name = receive_package.pop("net_func_name", None)
-                        get_key = receive_package.pop("net_get_key", None)
+                    elif not code:
+                        await cl_unit.send_log_error("Receive data must has 'code' key")
+
+                    elif code == _GET_REQ:
+                        get_key = receive_package.get("net_get_key", None)
                         if get_key is None:
                             continue
 
                         data = await cls._call_func(
-                            func_name,
+                            receive_package.get("net_func_name", None),
                             cl_unit,
-                            **receive_package,
+                            receive_package,
                         )
                         await cl_unit.send_package(
                             ResponseCode.GET_REQ, get_key=get_key, data=data
@@ -380,18 +522,35 @@ class Server:
 
         finally:
             async with cls._cl_units_lock:
-                cls._cl_units.pop(cl_unit.login, None)
+                if cls._cl_units.get(cl_unit.login) is cl_unit:
+                    del cls._cl_units[cl_unit.login]
 
             await cl_unit.disconnect()
             logger.info(f"{cl_unit.login} is disconected")
             await cls._update_server_on_hubs({"cur_players": len(cls._cl_units)})
 
     @classmethod
-    async def _auth(cls, cl_unit: ClUnit) -> None:
-        if cls._max_players != -1 and cls._max_players <= len(cls._cl_units):
-            raise ValueError("Server is full")
+    async def _close_replaced_session(cls, cl_unit: ClUnit) -> None:
+        """Отключение старой сессии пользователя, который вошёл повторно.
 
-        await cl_unit.send_package(ResponseCode.AUTH_REQ)
+        Старое соединение может быть полуоткрытым (клиент упал без FIN),
+        поэтому ожидание закрытия ограничено таймаутом, после чего
+        соединение обрывается.
+        """
+        try:
+            await asyncio.wait_for(
+                cl_unit.disconnect("Logged in from another location"), cls._timeout
+            )
+
+        except Exception as err:
+            logger.warning(
+                f"Failed to close previous session of {cl_unit.login}: {err}"
+            )
+            cl_unit.writer.transport.abort()
+
+    @classmethod
+    async def _auth(cls, cl_unit: ClUnit) -> None:
+        await cl_unit.write_raw(_AUTH_REQ_PACKAGE)
         receive_package = await asyncio.wait_for(
             cl_unit.receive_package(), cls._timeout
         )
@@ -403,30 +562,34 @@ class Server:
         if not code:
             raise ValueError("Receive data must has 'code' key")
 
-        code = ResponseCode(code)
-
-        if not ResponseCode.is_client_auth(code):
+        if code not in _CLIENT_AUTH_CODE_VALUES:
             raise ValueError("Unknown 'code' for auth type")
 
         login = receive_package.get("login", None)
         password = receive_package.get("password", None)
-        if not all([login, password]):
+        if not login or not password:
             raise ValueError("Receive data must has 'login' and 'password' keys")
 
         if code == ResponseCode.AUTH_ANS_REGIS:
             if not cls._allow_registration:
                 raise ValueError("Registration is not allowed")
 
+            if cls._is_full():
+                raise ValueError("Server is full")
+
             await ServerDB.add_user(login, password)
             cl_unit.login = login
 
         else:
             await ServerDB.login_user(login, password)
+
+            # Повторный вход заменяет старую сессию и не занимает новое место
+            if login not in cls._cl_units and cls._is_full():
+                raise ValueError("Server is full")
+
             cl_unit.login = login
 
-        await cl_unit.send_package(
-            ResponseCode.AUTH_ANS_SERVE, server_name=cls._server_name
-        )
+        await cl_unit.write_raw(cls._auth_serve_package)
         await cls._update_server_on_hubs({"cur_players": len(cls._cl_units)})
 
     @classmethod
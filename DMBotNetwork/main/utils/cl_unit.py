@@ -1,16 +1,31 @@
 import asyncio
 import base64
-import json
+from collections import deque
 from pathlib import Path
-from typing import Optional
+from typing import Deque, Optional
 
 import aiofiles
+import msgpack
 
 from .response_code import ResponseCode
 
 
 class ClUnit:
-    __slots__ = ["login", "_reader", "_writer"]
+    __slots__ = [
+        "login",
+        "_reader",
+        "_writer",
+        "_send_buffer",
+        "_flush_handle",
+        "_recv_buffer",
+        "_recv_queue",
+    ]
+
+    # Размер буфера отправки, при котором он сбрасывается в сокет сразу,
+    # не дожидаясь конца итерации цикла событий
+    _flush_threshold: int = 64 * 1024
+    # Сколько байт запрашивается у потока за одно чтение
+    _read_chunk_size: int = 64 * 1024
 
     def __init__(
         self, login, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
@@ -25,6 +40,10 @@ class ClUnit:
         self.login = login
         self._reader = reader
         self._writer = writer
+        self._send_buffer = bytearray()
+        self._flush_handle: Optional[asyncio.Handle] = None
+        self._recv_buffer = bytearray()
+        self._recv_queue: Deque[bytes] = deque()
 
     def __eq__(self, value: object) -> bool:
         if isinstance(value, str):
@@ -64,9 +83,40 @@ class ClUnit:
             code (ResponseCode): Код ответа для отправки.
             **kwargs: Дополнительные данные для передачи.
         """
-        payload = {"code": code.value, **kwargs}
-        en_data = self._encode_data(payload)
-        await self._send_raw_data(en_data)
+        await self._send_raw_data(self.encode_package(code, **kwargs))
+
+    @staticmethod
+    def encode_package(code: ResponseCode, **kwargs) -> bytes:
+        """Кодирование пакета данных без отправки.
+
+        Закодированный пакет можно отправить нескольким подключениям через
+        write_raw, не кодируя его для каждого заново.
+
+        Args:
+            code (ResponseCode): Код ответа для отправки.
+            **kwargs: Дополнительные данные для передачи.
+
+        Returns:
+            bytes: Закодированный пакет.
+        """
+        return ClUnit._encode_data({"code": code.value, **kwargs})
+
+    async def write_raw(self, data: bytes) -> None:
+        """Отправка пакета, закодированного через encode_package.
+
+        Args:
+            data (bytes): Закодированный пакет.
+        """
+        await self._send_raw_data(data)
+
+    def queue_raw(self, data: bytes) -> None:
+        """Постановка пакета, закодированного через encode_package, в буфер
+        отправки без ожидания освобождения сокета.
+
+        Args:
+            data (bytes): Закодированный пакет.
+        """
+        self._queue_raw_data(data)
 
     async def receive_package(self) -> dict:
         """Получение и декодирование пакета данных.
@@ -151,8 +201,9 @@ class ClUnit:
         """
         await self.send_package(ResponseCode.NET_REQ, net_func_name=func_name, **kwargs)
 
-    def _encode_data(self, data: dict) -> bytes:
-        """Кодирование данных в JSON-формат.
+    @staticmethod
+    def _encode_data(data: dict) -> bytes:
+        """Кодирование данных в формат MessagePack.
 
         Args:
             data (dict): Данные для кодирования.
@@ -160,11 +211,13 @@ class ClUnit:
         Returns:
             bytes: Закодированные данные в формате байт.
         """
-        json_data = json.dumps(data, ensure_ascii=False)
-        return json_data.encode("utf-8")
+        return msgpack.packb(data, use_bin_type=True)
 
     def _decode_data(self, encoded_data: bytes) -> dict:
-        """Декодирование данных из байт в JSON-формат.
+        """Декодирование данных из формата MessagePack.
+
+        Ключами словарей могут быть только строки и байты: это защищает
+        от пакетов с подобранными коллизиями хешей int-ключей.
 
         Args:
             encoded_data (bytes): Закодированные данные.
@@ -172,8 +225,7 @@ class ClUnit:
         Returns:
             dict: Декодированные данные в виде словаря.
         """
-        json_data = encoded_data.decode("utf-8")
-        return json.loads(json_data)
+        return msgpack.unpackb(encoded_data, raw=False)
 
     async def _send_raw_data(self, data: bytes) -> None:
         """Асинхронная отправка сырых данных.
@@ -181,29 +233,97 @@ class ClUnit:
         Args:
             data (bytes): Данные для отправки.
         """
-        self._writer.write(len(data).to_bytes(4, "big"))
+        self._queue_raw_data(data)
         await self._writer.drain()
 
-        self._writer.write(data)
-        await self._writer.drain()
+    def _queue_raw_data(self, data: bytes) -> None:
+        """Постановка сырых данных в буфер отправки без ожидания сокета.
+
+        Буфер сбрасывается в сокет одним вызовом write в конце текущей
+        итерации цикла событий или сразу, если превысил _flush_threshold.
+
+        Args:
+            data (bytes): Данные для отправки.
+        """
+        self._send_buffer += len(data).to_bytes(4, "big")
+        self._send_buffer += data
+
+        if len(self._send_buffer) >= self._flush_threshold:
+            self._flush_send_buffer()
+
+        elif self._flush_handle is None:
+            self._flush_handle = asyncio.get_running_loop().call_soon(
+                self._flush_send_buffer
+            )
+
+    def _flush_send_buffer(self) -> None:
+        """Запись накопленного буфера отправки в сокет."""
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+
+        if not self._send_buffer:
+            return
+
+        data, self._send_buffer = self._send_buffer, bytearray()
+        if not self._writer.is_closing():
+            self._writer.write(data)
 
     async def _receive_raw_data(self) -> bytes:
         """Асинхронное получение сырых данных.
 
+        Из потока читается сразу до _read_chunk_size байт, и все целые
+        пакеты из прочитанного складываются в очередь. Следующие вызовы
+        отдают пакеты из очереди без ожидания потока.
+
         Returns:
             bytes: Полученные данные в байтовом формате.
+
+        Raises:
+            IncompleteReadError: Если поток закрылся раньше конца пакета.
         """
-        data_length_bytes = await self._reader.readexactly(4)
-        data_length = int.from_bytes(data_length_bytes, "big")
+        while not self._recv_queue:
+            chunk = await self._reader.read(self._read_chunk_size)
+            if not chunk:
+                raise asyncio.IncompleteReadError(bytes(self._recv_buffer), None)
+
+            self._recv_buffer += chunk
+            self._split_recv_buffer()
+
+        return self._recv_queue.popleft()
+
+    def _split_recv_buffer(self) -> None:
+        """Перенос всех целых пакетов из буфера чтения в очередь."""
+        offset = 0
+        buffer_size = len(self._recv_buffer)
+
+        with memoryview(self._recv_buffer) as view:
+            while buffer_size - offset >= 4:
+                data_length = int.from_bytes(view[offset : offset + 4], "big")
+                end = offset + 4 + data_length
+                if end > buffer_size:
+                    break
+
+                self._recv_queue.append(bytes(view[offset + 4 : end]))
+                offset = end
 
-        return await self._reader.readexactly(data_length)
+        if offset:
+            del self._recv_buffer[:offset]
 
     async def disconnect(self, reason: Optional[str] = None) -> None:
-        """Отключение соединения."""
+        """Отключение соединения.
+
+        Пакет с причиной отключения не ждёт освобождения сокета: он
+        дописывается в буфер отправки и уходит вместе с закрытием.
+        """
         if reason is not None:
-            await self.send_package(ResponseCode.DISCONNECT, reason=reason)
-        
+            self._queue_raw_data(
+                self.encode_package(ResponseCode.DISCONNECT, reason=reason)
+            )
+
         if self._writer:
+            self._flush_send_buffer()
+
             try:
                 self._writer.close()
                 await self._writer.wait_closed()
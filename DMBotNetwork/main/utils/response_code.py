@@ -26,27 +26,46 @@ class ResponseCode(IntEnum):
     LOG_ERR = 44  # Запрос на отправку логов уровня ERROR
 
     # Методы для проверки типа кода
-    @classmethod
-    def is_auth(cls, code) -> bool:
-        return code in {
-            cls.AUTH_REQ,
-            cls.AUTH_ANS_LOGIN,
-            cls.AUTH_ANS_REGIS,
-            cls.AUTH_ANS_SERVE,
-        }
-
-    @classmethod
-    def is_client_auth(cls, code) -> bool:
-        return code in {cls.AUTH_ANS_LOGIN, cls.AUTH_ANS_REGIS}
-
-    @classmethod
-    def is_net(cls, code) -> bool:
-        return code == cls.NET_REQ
-
-    @classmethod
-    def is_file(cls, code) -> bool:
-        return code in {cls.FIL_REQ, cls.FIL_END}
-
-    @classmethod
-    def is_log(cls, code) -> bool:
-        return code in {cls.LOG_DEB, cls.LOG_INF, cls.LOG_WAR, cls.LOG_ERR}
+    @staticmethod
+    def is_auth(code) -> bool:
+        return code in _AUTH_CODES
+
+    @staticmethod
+    def is_client_auth(code) -> bool:
+        return code in _CLIENT_AUTH_CODES
+
+    @staticmethod
+    def is_net(code) -> bool:
+        return code == _NET_CODE
+
+    @staticmethod
+    def is_file(code) -> bool:
+        return code in _FILE_CODES
+
+    @staticmethod
+    def is_log(code) -> bool:
+        return code in _LOG_CODES
+
+
+# Наборы кодов собираются один раз, а не при каждом вызове is_*
+_AUTH_CODES = frozenset(
+    {
+        ResponseCode.AUTH_REQ,
+        ResponseCode.AUTH_ANS_LOGIN,
+        ResponseCode.AUTH_ANS_REGIS,
+        ResponseCode.AUTH_ANS_SERVE,
+    }
+)
+_CLIENT_AUTH_CODES = frozenset(
+    {ResponseCode.AUTH_ANS_LOGIN, ResponseCode.AUTH_ANS_REGIS}
+)
+_NET_CODE = int(ResponseCode.NET_REQ)
+_FILE_CODES = frozenset({ResponseCode.FIL_REQ, ResponseCode.FIL_END})
+_LOG_CODES = frozenset(
+    {
+        ResponseCode.LOG_DEB,
+        ResponseCode.LOG_INF,
+        ResponseCode.LOG_WAR,
+        ResponseCode.LOG_ERR,
+    }
+)
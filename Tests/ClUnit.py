@@ -0,0 +1,64 @@
+import asyncio
+import unittest
+
+from DMBotNetwork.main.client import Client
+from DMBotNetwork.main.utils.cl_unit import ClUnit
+from DMBotNetwork.main.utils.response_code import ResponseCode
+
+
+def make_frame(code: ResponseCode, **kwargs) -> bytes:
+    data = ClUnit.encode_package(code, **kwargs)
+    return len(data).to_bytes(4, "big") + data
+
+
+class TestClUnitReceive(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        self.reader = asyncio.StreamReader()
+        self.cl_unit = ClUnit("test_user", self.reader, None)
+
+    async def test_several_packages_in_one_read(self):
+        self.reader.feed_data(
+            make_frame(ResponseCode.LOG_INF, message="first")
+            + make_frame(ResponseCode.NET_REQ, net_func_name="ping")
+        )
+
+        first = await self.cl_unit.receive_package()
+        second = await self.cl_unit.receive_package()
+
+        self.assertEqual(first, {"code": 42, "message": "first"})
+        self.assertEqual(second, {"code": 20, "net_func_name": "ping"})
+
+    async def test_package_split_between_reads(self):
+        frame = make_frame(ResponseCode.LOG_INF, message="x" * 1000)
+        self.reader.feed_data(frame[:3])
+
+        task = asyncio.create_task(self.cl_unit.receive_package())
+        await asyncio.sleep(0)
+        self.reader.feed_data(frame[3:500])
+        await asyncio.sleep(0)
+        self.assertFalse(task.done())
+
+        self.reader.feed_data(frame[500:])
+        package = await task
+        self.assertEqual(package, {"code": 42, "message": "x" * 1000})
+
+    async def test_eof_inside_package(self):
+        frame = make_frame(ResponseCode.LOG_INF, message="lost")
+        self.reader.feed_data(frame[:-1])
+        self.reader.feed_eof()
+
+        with self.assertRaises(asyncio.IncompleteReadError):
+            await self.cl_unit.receive_package()
+
+    async def test_non_str_map_keys(self):
+        data = {1: "a", "nested": {2: [3, {4.5: None}]}}
+        encoded = ClUnit.encode_package(ResponseCode.GET_REQ, get_key="k", data=data)
+        self.assertEqual(Client._decode_data(encoded)["data"], data)
+
+        self.reader.feed_data(make_frame(ResponseCode.NET_REQ, data={1: "a"}))
+        with self.assertRaises(ValueError):
+            await self.cl_unit.receive_package()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,233 @@
+import asyncio
+import unittest
+from typing import Annotated, List, Optional
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from DMBotNetwork.main.server import Server
+from DMBotNetwork.main.utils import ClUnit, ResponseCode, ServerDB
+
+
+class NetClassTest:
+    @staticmethod
+    async def net_echo(cl_unit, value: int, note: Optional[str] = None):
+        return value, note
+
+    @staticmethod
+    def net_sync_echo(cl_unit, items: List[str]):
+        return items
+
+    @staticmethod
+    def net_annotated(cl_unit, value: Annotated[int, "meta"]):
+        return value
+
+    @staticmethod
+    def net_none(cl_unit, value: None = None):
+        return value
+
+
+class FakeWriter:
+    """StreamWriter, который копит данные; paused имитирует клиента,
+    переставшего читать: drain() тогда не завершается. При закрытии
+    в связанный reader передаётся EOF, как при закрытии сокета."""
+
+    def __init__(
+        self, paused: bool = False, reader: Optional[asyncio.StreamReader] = None
+    ) -> None:
+        self.data = bytearray()
+        self.paused = paused
+        self.closed = False
+        self._reader = reader
+
+    def write(self, data: bytes) -> None:
+        self.data += data
+
+    def is_closing(self) -> bool:
+        return self.closed
+
+    async def drain(self) -> None:
+        if self.paused:
+            await asyncio.Event().wait()
+
+    def close(self) -> None:
+        if not self.closed and self._reader is not None:
+            self._reader.feed_eof()
+
+        self.closed = True
+
+    async def wait_closed(self) -> None:
+        pass
+
+
+class TestServerDispatch(unittest.IsolatedAsyncioTestCase):
+    @classmethod
+    def setUpClass(cls):
+        Server.register_methods_from_class(NetClassTest)
+
+    def setUp(self):
+        self.cl_unit = MagicMock()
+        self.cl_unit.send_log_error = AsyncMock()
+
+    async def test_call_async_func(self):
+        package = {"code": 20, "value": 1, "note": "a", "unknown": True}
+        result = await Server._call_func("echo", self.cl_unit, package)
+        self.assertEqual(result, (1, "a"))
+
+    async def test_call_sync_func(self):
+        result = await Server._call_func("sync_echo", self.cl_unit, {"items": ["a"]})
+        self.assertEqual(result, ["a"])
+
+    async def test_type_mismatch(self):
+        result = await Server._call_func("echo", self.cl_unit, {"value": "1"})
+        self.assertIsNone(result)
+        self.cl_unit.send_log_error.assert_awaited_once()
+
+    async def test_annotated_arg(self):
+        result = await Server._call_func("annotated", self.cl_unit, {"value": 1})
+        self.assertEqual(result, 1)
+
+    async def test_none_annotated_arg(self):
+        result = await Server._call_func("none", self.cl_unit, {"value": None})
+        self.assertIsNone(result)
+        self.cl_unit.send_log_error.assert_not_awaited()
+
+        await Server._call_func("none", self.cl_unit, {"value": 1})
+        self.cl_unit.send_log_error.assert_awaited_once()
+
+    async def test_unknown_func(self):
+        result = await Server._call_func("missing", self.cl_unit, {})
+        self.assertIsNone(result)
+
+
+class TestServerBroadcast(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        self.slow_writer = FakeWriter(paused=True)
+        self.fast_writer = FakeWriter()
+        self.cl_units = {
+            "slow": ClUnit("slow", None, self.slow_writer),
+            "fast": ClUnit("fast", None, self.fast_writer),
+        }
+
+    async def test_broadcast_not_blocked_by_paused_recipient(self):
+        task = asyncio.create_task(
+            Server.broadcast("send_log_info", self.cl_units, "hello")
+        )
+        for _ in range(5):
+            await asyncio.sleep(0)
+
+        expected = ClUnit.encode_package(ResponseCode.LOG_INF, message="hello")
+        self.assertIn(expected, self.fast_writer.data)
+        self.assertIn(expected, self.slow_writer.data)
+
+        task.cancel()
+        with self.assertRaises(asyncio.CancelledError):
+            await task
+
+    async def test_broadcast_package_encodes_once(self):
+        with patch.object(
+            ClUnit, "encode_package", wraps=ClUnit.encode_package
+        ) as encode_package:
+            task = asyncio.create_task(
+                Server.broadcast_package(
+                    ResponseCode.NET_REQ, self.cl_units, net_func_name="ping"
+                )
+            )
+            for _ in range(5):
+                await asyncio.sleep(0)
+
+        encode_package.assert_called_once_with(
+            ResponseCode.NET_REQ, net_func_name="ping"
+        )
+        data = ClUnit.encode_package(ResponseCode.NET_REQ, net_func_name="ping")
+        expected = len(data).to_bytes(4, "big") + data
+        self.assertEqual(self.fast_writer.data, expected)
+        self.assertEqual(self.slow_writer.data, expected)
+
+        task.cancel()
+        with self.assertRaises(asyncio.CancelledError):
+            await task
+
+
+class TestServerSessions(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        async def fake_auth(cl_unit):
+            cl_unit.login = "test_user"
+
+        self.auth_patch = patch.object(
+            Server, "_auth", new=AsyncMock(side_effect=fake_auth)
+        )
+        self.auth_patch.start()
+        Server._is_online = True
+
+    async def asyncTearDown(self):
+        self.auth_patch.stop()
+        Server._is_online = False
+        Server._cl_units.clear()
+
+    def connect(self):
+        reader = asyncio.StreamReader()
+        writer = FakeWriter(reader=reader)
+        task = asyncio.create_task(Server._cl_handler(reader, writer))
+        return reader, writer, task
+
+    async def wait_registered(self, writer: FakeWriter) -> None:
+        for _ in range(100):
+            cl_unit = Server._cl_units.get("test_user")
+            if cl_unit is not None and cl_unit.writer is writer:
+                return
+
+            await asyncio.sleep(0)
+
+        self.fail("Session was not registered")
+
+    async def test_new_login_replaces_old_session(self):
+        _, old_writer, old_task = self.connect()
+        await self.wait_registered(old_writer)
+
+        new_reader, new_writer, new_task = self.connect()
+        await self.wait_registered(new_writer)
+        await asyncio.wait_for(old_task, 1)
+
+        expected = ClUnit.encode_package(
+            ResponseCode.DISCONNECT, reason="Logged in from another location"
+        )
+        self.assertIn(expected, old_writer.data)
+        self.assertTrue(old_writer.closed)
+        self.assertIs(Server._cl_units["test_user"].writer, new_writer)
+
+        new_reader.feed_eof()
+        await asyncio.wait_for(new_task, 1)
+        self.assertNotIn("test_user", Server._cl_units)
+
+
+class TestServerCapacity(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        self.login_patch = patch.object(ServerDB, "login_user", new=AsyncMock())
+        self.login_patch.start()
+        Server._max_players = 1
+        Server._cl_units["test_user"] = ClUnit("test_user", None, FakeWriter())
+
+    async def asyncTearDown(self):
+        self.login_patch.stop()
+        Server._max_players = -1
+        Server._cl_units.clear()
+
+    def make_cl_unit(self, login: str) -> ClUnit:
+        reader = asyncio.StreamReader()
+        data = ClUnit.encode_package(
+            ResponseCode.AUTH_ANS_LOGIN, login=login, password="password"
+        )
+        reader.feed_data(len(data).to_bytes(4, "big") + data)
+        return ClUnit("init", reader, FakeWriter())
+
+    async def test_relogin_on_full_server(self):
+        cl_unit = self.make_cl_unit("test_user")
+        await Server._auth(cl_unit)
+        self.assertEqual(cl_unit.login, "test_user")
+
+    async def test_new_login_on_full_server(self):
+        with self.assertRaisesRegex(ValueError, "Server is full"):
+            await Server._auth(self.make_cl_unit("other_user"))
+
+
+if __name__ == "__main__":
+    unittest.main()
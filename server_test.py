@@ -39,4 +39,15 @@ if __name__ == "__main__":
     logger1 = logging.getLogger("aiosqlite")
     logger1.propagate = False
 
-    asyncio.run(main())
+    # Цикл событий выбирается при запуске: внутри Server.start он уже работает
+    try:
+        import uvloop
+
+    except ImportError:
+        uvloop = None
+
+    if uvloop is not None:
+        uvloop.run(main())
+
+    else:
+        asyncio.run(main())